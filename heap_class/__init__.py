@@ -1,7 +1,9 @@
 '''
 list-like implementation of heap/PriorityQueue.
 '''
+from bisect import insort
 from collections.abc import MutableSequence, Iterable, Iterator, Callable
+from operator import countOf
 from typing import TypeVar, Union, Optional, Any, cast
 # noinspection PyUnresolvedReferences,PyProtectedMember
 from heapq import (
@@ -9,6 +11,7 @@ from heapq import (
     _heappop_max as heappop_max,
     _heapreplace_max as heapreplace_max,
     _heapify_max as heapify_max,
+    _siftdown, _siftup,
     _siftdown_max, _siftup_max
 )
 
@@ -20,6 +23,13 @@ __version__ = '0.9.0b1'
 
 HeapContents = TypeVar('HeapContents')
 
+# below this size an unkeyed Heap keeps its backing list fully sorted
+# (pop-first-order), sidestepping the sift machinery whose constant
+# factors dominate at such sizes.  A sorted list is itself a valid
+# heap, so nothing else needs to care: the heap functions keep working
+# on it and the Heap simply stops re-sorting once it outgrows the tier.
+_SMALL_N = 8
+
 
 def heappush_max(heap, item):
     heap.append(item)
@@ -27,16 +37,145 @@ def heappush_max(heap, item):
 
 
 def heappushpop_max(heap, item):
-    if C_LANGUAGE_HEAP:
-        # if in C, fastest will probably be push then pop
-        heappush_max(heap, item)
-        return heappop_max(item)
-    else:
-        # do the manipulation efficiently but in Python
-        if heap and heap[0] > item:
-            item, heap[0] = heap[0], item
-            _siftup_max(heap, 0)
-        return item
+    # one compare + one sift, the same strategy heapq.heappushpop uses:
+    # no push when the new item would come straight back out, and no
+    # append/pop churn on the backing list when it would not.
+    if heap and heap[0] > item:
+        item, heap[0] = heap[0], item
+        _siftup_max(heap, 0)
+    return item
+
+
+try:
+    # optional compiled fast paths, built from _ext.pyx (see its
+    # docstring).  The module-level names above are what every method
+    # calls, so rebinding them here removes the Python-level function
+    # bodies with no per-call dispatch.  The min functions only need
+    # replacing when heapq's own C accelerator is missing.
+    from heap_class import _ext as _compiled_ext
+except ImportError:
+    _compiled_ext = None
+
+if _compiled_ext is not None:
+    heappush_max = _compiled_ext.push_max
+    heappop_max = _compiled_ext.pop_max
+    heappushpop_max = _compiled_ext.pushpop_max
+    if not C_LANGUAGE_HEAP:
+        heappush = _compiled_ext.push_min
+        heappop = _compiled_ext.pop_min
+        heappushpop = _compiled_ext.pushpop_min
+
+
+# -----------------------------------------------------------------------
+# keyed Heaps store parallel lists -- keys (compared) and values (carried
+# along) -- instead of (key, value) tuples.  Comparisons touch only the
+# scalar keys, with no tuple header in between, and equal keys never fall
+# through to comparing the values (which may not be orderable at all).
+# These mirror heapq's sift functions with the two lists swapped in
+# lockstep.
+
+def _siftdown_soa(keys, values, startpos, pos):
+    new_key = keys[pos]
+    new_value = values[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        parent = keys[parentpos]
+        if new_key < parent:
+            keys[pos] = parent
+            values[pos] = values[parentpos]
+            pos = parentpos
+        else:
+            break
+    keys[pos] = new_key
+    values[pos] = new_value
+
+
+def _siftup_soa(keys, values, pos):
+    endpos = len(keys)
+    startpos = pos
+    new_key = keys[pos]
+    new_value = values[pos]
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos and not keys[childpos] < keys[rightpos]:
+            childpos = rightpos
+        keys[pos] = keys[childpos]
+        values[pos] = values[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    keys[pos] = new_key
+    values[pos] = new_value
+    _siftdown_soa(keys, values, startpos, pos)
+
+
+def _siftdown_soa_max(keys, values, startpos, pos):
+    new_key = keys[pos]
+    new_value = values[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        parent = keys[parentpos]
+        if parent < new_key:
+            keys[pos] = parent
+            values[pos] = values[parentpos]
+            pos = parentpos
+        else:
+            break
+    keys[pos] = new_key
+    values[pos] = new_value
+
+
+def _siftup_soa_max(keys, values, pos):
+    endpos = len(keys)
+    startpos = pos
+    new_key = keys[pos]
+    new_value = values[pos]
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos and not keys[rightpos] < keys[childpos]:
+            childpos = rightpos
+        keys[pos] = keys[childpos]
+        values[pos] = values[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    keys[pos] = new_key
+    values[pos] = new_value
+    _siftdown_soa_max(keys, values, startpos, pos)
+
+
+def _heapify_soa(keys, values):
+    for i in reversed(range(len(keys) // 2)):
+        _siftup_soa(keys, values, i)
+
+
+def _heapify_soa_max(keys, values):
+    for i in reversed(range(len(keys) // 2)):
+        _siftup_soa_max(keys, values, i)
+
+
+def _heappop_soa(keys, values):
+    last_key = keys.pop()
+    last_value = values.pop()
+    if keys:
+        out = values[0]
+        keys[0] = last_key
+        values[0] = last_value
+        _siftup_soa(keys, values, 0)
+        return out
+    return last_value
+
+
+def _heappop_soa_max(keys, values):
+    last_key = keys.pop()
+    last_value = values.pop()
+    if keys:
+        out = values[0]
+        keys[0] = last_key
+        values[0] = last_value
+        _siftup_soa_max(keys, values, 0)
+        return out
+    return last_value
 
 
 class Heap(MutableSequence[HeapContents]):
@@ -50,10 +189,24 @@ class Heap(MutableSequence[HeapContents]):
         self.max = max
         self.key = key
 
-        items: list[Union[HeapContents], tuple[Any, HeapContents]]
-        self._heap: list[Union[HeapContents], tuple[Any, HeapContents]]
+        # unkeyed Heaps store items directly in _heap and use heapq;
+        # keyed Heaps store parallel _keys/_values lists (the unused
+        # attributes stay None).
+        self._heap: Optional[list[HeapContents]] = None
+        self._keys: Optional[list[Any]] = None
+        self._values: Optional[list[HeapContents]] = None
+        # True while the backing list of a small unkeyed Heap is kept
+        # fully sorted; see _SMALL_N.
+        self._sorted = False
+        self._bind_fast_methods()
+
         if _replace_heap:
-            self._heap = items
+            # items is the already-heapified backing list, or a
+            # (keys, values) pair of such lists when key is given.
+            if key is not None:
+                self._keys, self._values = items
+            else:
+                self._heap = items if items is not None else []
             return
 
         if others:
@@ -61,114 +214,221 @@ class Heap(MutableSequence[HeapContents]):
         elif not items:
             items = []
         else:
-            items = items[:]
+            items = list(items)
 
-        if self.key is not None:
-            items = [self._add_key(i) for i in items]
+        # a local name for the key keeps the construction pass to one
+        # tight comprehension: no bound-method call per item.
+        if key is not None:
+            self._keys = [key(i) for i in items]
+            self._values = items
+            if self.max:
+                _heapify_soa_max(self._keys, self._values)
+            else:
+                _heapify_soa(self._keys, self._values)
+            return
 
-        if items and self.max:
+        if len(items) < _SMALL_N:
+            items.sort(reverse=self.max)
+            self._sorted = True
+        elif self.max:
             heapify_max(items)
-        elif items:
+        else:
             heapify(items)
         self._heap = items
 
     def __getitem__(self, pos: int) -> HeapContents:
         '''
-        Quite inefficient.
+        O((pos + 1) log (pos + 1)) -- cheap for small pos, but
+        still inefficient for positions deep into the Heap.
         '''
+        values = self._heap if self.key is None else self._values
         if pos == 0:
-            return self._del_key(self._heap[0])
+            if not values:
+                raise IndexError('Heap index out of range')
+            return values[0]
         if pos < 0:
             pos = len(self) + pos
-
-        for i, item in enumerate(self._iter_with_key()):
-            if i == pos:
-                return self._del_key(item)
-        raise IndexError('Heap index out of range')
+        return values[self._kth_smallest(pos)]
 
     def __setitem__(self, pos: int, new_item: HeapContents) -> None:
         '''
-        Quite inefficient.  Simply removes the item at that position
-        and then appends a new one.  No guarantee at all that this will
-        be true:  `h[3] = 9;  h[3] == 9`.
+        Replaces the item at that sorted position with a new one and
+        re-sifts in place, O(log n) after finding the position.  No
+        guarantee at all that this will be true:  `h[3] = 9;  h[3] == 9`.
         '''
         if pos < 0:
             pos = len(self) + pos
-        if pos > len(self):
-            raise IndexError('Heap index out of range')
-
-        new_item = self._add_key(new_item)
-
-        new_items: list[HeapContents] = []
-        for i, item in enumerate(self._iter_with_key()):
-            if i != pos:
-                new_items.append(item)
-            else:
-                new_items.append(new_item)
-        if self.max:
-            heapify_max(new_items)
+        heap_index = self._kth_smallest(pos)
+        if self.key is None:
+            self._heap[heap_index] = new_item
         else:
-            heapify(new_items)
-        self._heap = new_items
+            self._keys[heap_index] = self.key(new_item)
+            self._values[heap_index] = new_item
+        self._sift_inplace(heap_index)
 
     def __delitem__(self, pos) -> None:
         '''
-        Quite inefficient
+        Swaps the item at that sorted position with the last item and
+        re-sifts in place, O(log n) after finding the position.
         '''
         if pos < 0:
             pos = len(self) + pos
-        if pos > len(self):
-            raise IndexError('Heap index out of range')
-
-        new_items = []
-        for i, item in enumerate(self._iter_with_key()):
-            if i != pos:
-                new_items.append(item)  # we reverse maxification
-        if self.max:
-            heapify_max(new_items)
-        else:
-            heapify(new_items)
-        self._heap = new_items
-
+        self._delete_at(self._kth_smallest(pos))
 
     def __len__(self) -> int:
-        return len(self._heap)
+        if self.key is None:
+            return len(self._heap)
+        return len(self._keys)
 
     def __bool__(self) -> bool:
-        return bool(self._heap)
+        if self.key is None:
+            return bool(self._heap)
+        return bool(self._keys)
 
     def __contains__(self, item: HeapContents) -> bool:
-        return self._add_key(item) in self._heap
+        if self.key is None:
+            return item in self._heap
+        return item in self._values
+
+    def __copy__(self) -> 'Heap[HeapContents]':
+        # a naive shallow copy would carry over the push/pop/pushpop/
+        # replace methods _bind_fast_methods stored in __dict__, still
+        # bound to this instance -- mutating the copy would mutate the
+        # original.  copy() builds a fresh instance with its own
+        # bindings.
+        return self.copy()
 
     def __iter__(self) -> Iterator[HeapContents]:
-        for item in self._iter_with_key():
-            yield self._del_key(item)
+        '''
+        Iterate in sorted order without disturbing the Heap.  One
+        C-level sorted() call replaces the old copy-and-pop-n-times
+        loop: the same O(n log n) compares, but no Python-level
+        iteration per element and far better cache behavior.
+        '''
+        if self.key is None:
+            if self._sorted:
+                # the small tier's backing list is already in order.
+                return iter(self._heap[:])
+            return iter(sorted(self._heap, reverse=self.max))
+        # sort positions by key so ties never compare the values.
+        keys = self._keys
+        values = self._values
+        order = sorted(range(len(keys)), key=keys.__getitem__,
+                       reverse=self.max)
+        return iter([values[i] for i in order])
 
     def __repr__(self) -> str:
         return f'Heap({list(self)}, max={self.max})'
 
     def __reversed__(self) -> 'Heap[HeapContents]':
-        return Heap(self.raw(), max=not self.max)
-
-    def _add_key(self, item: HeapContents) -> Union[HeapContents, tuple[Any, HeapContents]]:
-        if self.key is None:
-            return item
-        kv = self.key(item)
-        return (kv, item)
+        return Heap(self.raw(), max=not self.max, key=self.key)
 
-    def _del_key(self, item: Union[HeapContents, tuple[Any, HeapContents]]) -> HeapContents:
+    def _delete_at(self, heap_index: int) -> HeapContents:
+        '''
+        Remove and return the item at heap_index (an index into the
+        backing list) via swap-with-last plus an O(log n) sift.
+        '''
         if self.key is None:
-            return item
+            out = self._heap[heap_index]
+            last = self._heap.pop()
+            if heap_index < len(self._heap):
+                self._heap[heap_index] = last
+                self._sift_inplace(heap_index)
+            return out
+
+        out = self._values[heap_index]
+        last_key = self._keys.pop()
+        last_value = self._values.pop()
+        if heap_index < len(self._keys):
+            self._keys[heap_index] = last_key
+            self._values[heap_index] = last_value
+            self._sift_inplace(heap_index)
+        return out
+
+    def _indexes_in_order(self) -> Iterator[int]:
+        '''
+        Yield indexes into the backing list in sorted order by lazily
+        expanding a frontier of heap nodes: after a node is yielded its
+        two children become candidates.  Reaching the k-th item costs
+        O(k log k) and never copies the backing list.
+        '''
+        heap = self._heap if self.key is None else self._keys
+        n = len(heap)
+        if not n:
+            return
+        if self.max:
+            # store negated indexes so equal keys pop smallest-index
+            # first, matching the stable sorted(..., reverse=True) in
+            # __iter__; a plain index would pop largest-index first.
+            push, pop, sign = heappush_max, heappop_max, -1
         else:
-            return item[1]
+            push, pop, sign = heappush, heappop, 1
+
+        frontier = [(heap[0], 0)]
+        while frontier:
+            _, i = pop(frontier)
+            i *= sign
+            yield i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n:
+                    push(frontier, (heap[child], sign * child))
+
+    def _kth_smallest(self, pos: int) -> int:
+        '''
+        Return the index in the backing list of the item at sorted
+        position `pos` (`pos`-th smallest, or largest if max).
+        '''
+        if 0 <= pos < len(self):
+            for i, heap_index in enumerate(self._indexes_in_order()):
+                if i == pos:
+                    return heap_index
+        raise IndexError('Heap index out of range')
 
-    def _iter_with_key(self) -> Iterator[Union[tuple[Any, HeapContents], HeapContents]]:
-        temp_heap = self._heap[:]
-        while temp_heap:
+    def _sift_inplace(self, heap_index: int) -> None:
+        '''
+        Restore the heap invariant after the item at heap_index (an
+        index into the backing list) has been replaced.  Sifting both
+        directions is correct whether the new item is larger or smaller
+        than the one it replaced; only one direction actually moves it.
+        '''
+        self._sorted = False
+        if self.key is None:
             if self.max:
-                yield heappop_max(temp_heap)
+                _siftup_max(self._heap, heap_index)
+                _siftdown_max(self._heap, 0, heap_index)
             else:
-                yield heappop(temp_heap)
+                _siftup(self._heap, heap_index)
+                _siftdown(self._heap, 0, heap_index)
+        elif self.max:
+            _siftup_soa_max(self._keys, self._values, heap_index)
+            _siftdown_soa_max(self._keys, self._values, 0, heap_index)
+        else:
+            _siftup_soa(self._keys, self._values, heap_index)
+            _siftdown_soa(self._keys, self._values, 0, heap_index)
+
+    # noinspection PyShadowingBuiltins
+    @classmethod
+    def from_array(cls,
+                   array,
+                   *,
+                   max: bool = False,  # pylint: disable=redefined-builtin
+                   ) -> 'Heap[HeapContents]':
+        '''
+        Build a Heap from a homogeneous numeric numpy array.  When
+        Numba is installed, heapification runs as a compiled kernel on
+        the raw buffer -- no boxed-object compares, GIL released --
+        and only then is the result converted to a list; otherwise
+        this is equivalent to `Heap(array.tolist(), max=max)`.  The
+        input array is not modified.
+        '''
+        from heap_class._numba_heap import HAVE_NUMBA, heapify_numeric
+        if HAVE_NUMBA:
+            buffer = array.copy()
+            heapify_numeric(buffer, max=max)
+            # already a valid heap: skip the __init__ heapify.
+            return cls(buffer.tolist(), max=max, _replace_heap=True)
+
+        return cls(array.tolist(), max=max)
 
     def append(self, new_item: HeapContents) -> None:
         '''
@@ -177,28 +437,72 @@ class Heap(MutableSequence[HeapContents]):
         self.push(new_item)
 
     def clear(self) -> None:
-        self._heap = []
+        if self.key is None:
+            self._heap = []
+            self._sorted = True
+        else:
+            self._keys = []
+            self._values = []
 
     def copy(self) -> 'Heap[HeapContents]':
-        return Heap(self._heap[:], max=self.max, key=self.key, _replace_heap=True)
+        if self.key is None:
+            return Heap(self._heap[:], max=self.max, _replace_heap=True)
+        return Heap((self._keys[:], self._values[:]),
+                    max=self.max, key=self.key, _replace_heap=True)
 
     def count(self, item: HeapContents) -> int:
-        return self._heap.count(self._add_key(item))
+        '''
+        Number of occurrences of item, by value.  One C-level scan via
+        operator.countOf; keyed heaps scan the value column directly
+        (keys are not required to be unique, so counting keys would
+        over-count).
+        '''
+        if self.key is None:
+            return countOf(self._heap, item)
+        return countOf(self._values, item)
 
     def extend(self, others: Iterable[HeapContents]) -> None:
-        for o in others:
-            self.push(self._add_key(o))
+        '''
+        Bulk insert: append everything and rebuild with heapify, which
+        is O(n) by Floyd's bottom-up construction -- cheaper than n
+        individual O(log n) pushes.
+        '''
+        key = self.key
+        if key is None:
+            self._heap.extend(others)
+            if len(self._heap) < _SMALL_N:
+                self._heap.sort(reverse=self.max)
+                self._sorted = True
+            elif self.max:
+                self._sorted = False
+                heapify_max(self._heap)
+            else:
+                self._sorted = False
+                heapify(self._heap)
+            return
+
+        new_values = list(others)
+        self._values.extend(new_values)
+        self._keys.extend(key(o) for o in new_values)
+        if self.max:
+            _heapify_soa_max(self._keys, self._values)
+        else:
+            _heapify_soa(self._keys, self._values)
 
     def index(self, item: HeapContents, start: int = 0, end: int = -1) -> int:
         '''
-        Another inefficient operation
+        Return the position of item within the internal (arbitrary)
+        heap order -- the same ordering `raw()` exposes.  A heap has no
+        meaningful sorted position for anything but index 0, so this is
+        a single C-level list scan rather than a heap traversal.
         '''
-        keyed_item = self._add_key(item)
-        for i, existing in self._iter_with_key():
-            if existing == keyed_item and i >= start and (end == -1 or i < end):
-                return i
-
-        raise ValueError(f'{item!r} is not in Heap')
+        values = self._heap if self.key is None else self._values
+        if end == -1:
+            end = len(values)
+        try:
+            return values.index(item, start, end)
+        except ValueError:
+            raise ValueError(f'{item!r} is not in Heap') from None
 
     def insert(self, index: int, item: HeapContents) -> None:
         '''
@@ -212,63 +516,140 @@ class Heap(MutableSequence[HeapContents]):
 
     def peek(self) -> HeapContents:
         try:
-            return self._del_key(self._heap[0])
+            if self.key is None:
+                return self._heap[0]
+            return self._values[0]
         except IndexError:
             raise IndexError('peek on empty Heap') from None
 
-    def pop(self, index: int = 0) -> HeapContents:
-        if not self._heap:
-            raise IndexError('pop from empty Heap')
+    # ------------------------------------------------------------------
+    # push, pop, pushpop, and replace: one of each quartet below is
+    # bound to the public name per instance by _bind_fast_methods, so
+    # the hot calls never re-branch on self.max / self.key.
 
+    def _pop_slow(self, index: int) -> HeapContents:
+        if not self:
+            raise IndexError('pop from empty Heap')
         if index < 0:
-            index = len(self._heap) + index
-
+            index = len(self) + index
         if index == 0:
-            if self.max:
-                return self._del_key(heappop_max(self._heap))
-            else:
-                return self._del_key(heappop(self._heap))
-
-        if index < 0 or index >= len(self._heap):
+            return self.pop()
+        if index < 0 or index >= len(self):
             raise IndexError('pop index out of range')
+        return self._delete_at(self._kth_smallest(index))
 
-        # inefficient time.
-        new_items = []
-        o: HeapContents = self._heap[0]
-        i = 0
-        for i, item in enumerate(self._iter_with_key()):
-            if i == index:
-                o = self._del_key(item)
-            else:
-                new_items.append(item)
-
-        if self.max:
-            heapify_max(new_items)
-        else:
-            heapify(new_items)
-        self._heap = new_items
-        return o
-
-    def push(self, new_item: HeapContents) -> None:
-        if self.max:
-            heappush_max(self._heap, self._add_key(new_item))
-        else:
-            heappush(self._heap, self._add_key(new_item))
+    def _pop_min(self, index: int = 0) -> HeapContents:
+        if index:
+            return self._pop_slow(index)
+        heap = self._heap
+        if not heap:
+            raise IndexError('pop from empty Heap')
+        if self._sorted:
+            # first element of the sorted list; the rest stays sorted.
+            return heap.pop(0)
+        return heappop(heap)
+
+    def _pop_max(self, index: int = 0) -> HeapContents:
+        if index:
+            return self._pop_slow(index)
+        heap = self._heap
+        if not heap:
+            raise IndexError('pop from empty Heap')
+        if self._sorted:
+            return heap.pop(0)
+        return heappop_max(heap)
+
+    def _pop_min_keyed(self, index: int = 0) -> HeapContents:
+        if index:
+            return self._pop_slow(index)
+        if not self._keys:
+            raise IndexError('pop from empty Heap')
+        return _heappop_soa(self._keys, self._values)
 
-    def pushpop(self, new_item: HeapContents) -> HeapContents:
-        new_item = self._add_key(new_item)
-        if self.max:
-            o = heappushpop_max(self._heap, new_item)
-        else:
-            o = heappushpop(self._heap, new_item)
-        return self._del_key(o)
+    def _pop_max_keyed(self, index: int = 0) -> HeapContents:
+        if index:
+            return self._pop_slow(index)
+        if not self._keys:
+            raise IndexError('pop from empty Heap')
+        return _heappop_soa_max(self._keys, self._values)
+
+    def _push_min(self, new_item: HeapContents) -> None:
+        heap = self._heap
+        if self._sorted:
+            if len(heap) < _SMALL_N:
+                insort(heap, new_item)
+                return
+            # outgrew the small tier: the sorted list is already a
+            # valid heap, so just stop re-sorting.
+            self._sorted = False
+        heappush(heap, new_item)
+
+    def _push_max(self, new_item: HeapContents) -> None:
+        heap = self._heap
+        if self._sorted:
+            if len(heap) < _SMALL_N:
+                # descending insert; a linear scan is cheapest at this
+                # size.
+                i = 0
+                while i < len(heap) and heap[i] > new_item:
+                    i += 1
+                heap.insert(i, new_item)
+                return
+            self._sorted = False
+        heappush_max(heap, new_item)
+
+    def _push_min_keyed(self, new_item: HeapContents) -> None:
+        keys = self._keys
+        keys.append(self.key(new_item))
+        self._values.append(new_item)
+        _siftdown_soa(keys, self._values, 0, len(keys) - 1)
+
+    def _push_max_keyed(self, new_item: HeapContents) -> None:
+        keys = self._keys
+        keys.append(self.key(new_item))
+        self._values.append(new_item)
+        _siftdown_soa_max(keys, self._values, 0, len(keys) - 1)
+
+    def _pushpop_min(self, new_item: HeapContents) -> HeapContents:
+        self._sorted = False
+        return heappushpop(self._heap, new_item)
+
+    def _pushpop_max(self, new_item: HeapContents) -> HeapContents:
+        self._sorted = False
+        return heappushpop_max(self._heap, new_item)
+
+    def _pushpop_min_keyed(self, new_item: HeapContents) -> HeapContents:
+        keys = self._keys
+        kv = self.key(new_item)
+        if keys and keys[0] < kv:
+            out = self._values[0]
+            keys[0] = kv
+            self._values[0] = new_item
+            _siftup_soa(keys, self._values, 0)
+            return out
+        return new_item
+
+    def _pushpop_max_keyed(self, new_item: HeapContents) -> HeapContents:
+        keys = self._keys
+        kv = self.key(new_item)
+        if keys and keys[0] > kv:
+            out = self._values[0]
+            keys[0] = kv
+            self._values[0] = new_item
+            _siftup_soa_max(keys, self._values, 0)
+            return out
+        return new_item
 
     def raw(self) -> list[HeapContents]:
         '''
         The `raw` method returns the contents of the heap in
         arbitrary order.  Useful for efficiently calling `set(h.raw())`.
         '''
-        return [self._del_key(i) for i in self._heap]
+        if self.key is None:
+            # one C-level copy; handing out self._heap itself would let
+            # callers scramble the heap.
+            return self._heap[:]
+        return self._values[:]
 
     def remove(self, item: HeapContents) -> None:
         '''
@@ -277,36 +658,89 @@ class Heap(MutableSequence[HeapContents]):
         might not be the same as if you iterated through the Heap and
         removed the smallest/largest item that equaled item.
         '''
+        values = self._heap if self.key is None else self._values
         try:
-            self._heap.remove(self._add_key(item))
+            heap_index = values.index(item)
         except ValueError:
-            raise ValueError('Heap.remove(x): x not in Heap')
-
-        if self.max:
-            heapify_max(self._heap)
-        else:
-            heapify(self._heap)
-
-    def replace(self, item: HeapContents) -> HeapContents:
+            raise ValueError('Heap.remove(x): x not in Heap') from None
+        self._delete_at(heap_index)
+
+    # replace: "replace the first item with the new item", the same as
+    # heapreplace -- again one specialization per instance shape.
+
+    def _replace_min(self, item: HeapContents) -> HeapContents:
+        self._sorted = False
+        return heapreplace(self._heap, item)
+
+    def _replace_max(self, item: HeapContents) -> HeapContents:
+        self._sorted = False
+        return heapreplace_max(self._heap, item)
+
+    def _replace_min_keyed(self, item: HeapContents) -> HeapContents:
+        out = self._values[0]
+        self._keys[0] = self.key(item)
+        self._values[0] = item
+        _siftup_soa(self._keys, self._values, 0)
+        return out
+
+    def _replace_max_keyed(self, item: HeapContents) -> HeapContents:
+        out = self._values[0]
+        self._keys[0] = self.key(item)
+        self._values[0] = item
+        _siftup_soa_max(self._keys, self._values, 0)
+        return out
+
+    def _bind_fast_methods(self) -> None:
         '''
-        Replace the first item with the new item.  Same as heapreplace
+        Bind push, pop, pushpop, and replace to the implementations
+        specialized for this instance's direction and key, chosen once
+        here (and re-chosen by reverse()) instead of re-branching on
+        self.max / self.key at every call.
         '''
-        item = self._add_key(item)
-        if self.max:
-            o = heapreplace_max(self._heap, item)
+        if self.key is None:
+            if self.max:
+                self.push = self._push_max
+                self.pop = self._pop_max
+                self.pushpop = self._pushpop_max
+                self.replace = self._replace_max
+            else:
+                self.push = self._push_min
+                self.pop = self._pop_min
+                self.pushpop = self._pushpop_min
+                self.replace = self._replace_min
+        elif self.max:
+            self.push = self._push_max_keyed
+            self.pop = self._pop_max_keyed
+            self.pushpop = self._pushpop_max_keyed
+            self.replace = self._replace_max_keyed
         else:
-            o = heapreplace(self._heap, item)
-        return self._del_key(o)
+            self.push = self._push_min_keyed
+            self.pop = self._pop_min_keyed
+            self.pushpop = self._pushpop_min_keyed
+            self.replace = self._replace_min_keyed
 
     def reverse(self) -> None:
         '''
         O(n) operation
         '''
         self.max = not self.max
-        if self.max:
-            heapify_max(self._heap)
+        self._bind_fast_methods()
+        if len(self) < 2:
+            # zero or one item is a valid heap in either direction.
+            return
+        if self._sorted:
+            # reversing the sorted list sorts it for the new direction.
+            self._heap.reverse()
+            return
+        if self.key is None:
+            if self.max:
+                heapify_max(self._heap)
+            else:
+                heapify(self._heap)
+        elif self.max:
+            _heapify_soa_max(self._keys, self._values)
         else:
-            heapify(self._heap)
+            _heapify_soa(self._keys, self._values)
 
     def sort(self, key=None) -> None:
         '''
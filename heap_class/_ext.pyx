@@ -0,0 +1,120 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+'''
+Optional Cython-compiled heap primitives for heap_class.
+
+Build in place with:
+
+    cythonize -i heap_class/_ext.pyx
+
+heap_class binds these over its Python-level helpers when the compiled
+module is importable and falls back to heapq otherwise, so building the
+extension is never required -- it just removes the per-operation Python
+dispatch (most usefully for the _max functions, which heapq only
+provides as private pure-python helpers on older CPythons).
+'''
+
+
+cdef _siftdown_min(list heap, Py_ssize_t startpos, Py_ssize_t pos):
+    cdef Py_ssize_t parentpos
+    newitem = heap[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        parent = heap[parentpos]
+        if newitem < parent:
+            heap[pos] = parent
+            pos = parentpos
+        else:
+            break
+    heap[pos] = newitem
+
+
+cdef _siftup_min(list heap, Py_ssize_t pos):
+    cdef Py_ssize_t endpos = len(heap)
+    cdef Py_ssize_t startpos = pos
+    cdef Py_ssize_t childpos = 2 * pos + 1
+    cdef Py_ssize_t rightpos
+    newitem = heap[pos]
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos and not heap[childpos] < heap[rightpos]:
+            childpos = rightpos
+        heap[pos] = heap[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    heap[pos] = newitem
+    _siftdown_min(heap, startpos, pos)
+
+
+cdef _siftdown_max(list heap, Py_ssize_t startpos, Py_ssize_t pos):
+    cdef Py_ssize_t parentpos
+    newitem = heap[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        parent = heap[parentpos]
+        if parent < newitem:
+            heap[pos] = parent
+            pos = parentpos
+        else:
+            break
+    heap[pos] = newitem
+
+
+cdef _siftup_max(list heap, Py_ssize_t pos):
+    cdef Py_ssize_t endpos = len(heap)
+    cdef Py_ssize_t startpos = pos
+    cdef Py_ssize_t childpos = 2 * pos + 1
+    cdef Py_ssize_t rightpos
+    newitem = heap[pos]
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos and not heap[rightpos] < heap[childpos]:
+            childpos = rightpos
+        heap[pos] = heap[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    heap[pos] = newitem
+    _siftdown_max(heap, startpos, pos)
+
+
+cpdef push_min(list heap, item):
+    heap.append(item)
+    _siftdown_min(heap, 0, len(heap) - 1)
+
+
+cpdef pop_min(list heap):
+    lastelt = heap.pop()
+    if heap:
+        returnitem = heap[0]
+        heap[0] = lastelt
+        _siftup_min(heap, 0)
+        return returnitem
+    return lastelt
+
+
+cpdef pushpop_min(list heap, item):
+    if heap and heap[0] < item:
+        item, heap[0] = heap[0], item
+        _siftup_min(heap, 0)
+    return item
+
+
+cpdef push_max(list heap, item):
+    heap.append(item)
+    _siftdown_max(heap, 0, len(heap) - 1)
+
+
+cpdef pop_max(list heap):
+    lastelt = heap.pop()
+    if heap:
+        returnitem = heap[0]
+        heap[0] = lastelt
+        _siftup_max(heap, 0)
+        return returnitem
+    return lastelt
+
+
+cpdef pushpop_max(list heap, item):
+    if heap and heap[0] > item:
+        item, heap[0] = heap[0], item
+        _siftup_max(heap, 0)
+    return item
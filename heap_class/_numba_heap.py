@@ -0,0 +1,96 @@
+'''
+Optional Numba-compiled heapify for homogeneous numeric arrays.
+
+Used by `Heap.from_array`.  When Numba is installed the kernels run on
+the raw buffer with no boxed-object compares and with the GIL released;
+when it is not, the same functions run as plain Python and callers are
+expected to prefer heapq instead (see `HAVE_NUMBA`).
+
+`cache=True` keeps the JIT warmup to the first run per machine rather
+than the first call per process.
+'''
+
+try:
+    # noinspection PyUnresolvedReferences
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):  # pylint: disable=unused-argument
+        '''
+        Decorator stand-in when Numba is not installed: returns the
+        function unchanged.
+        '''
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True, nogil=True)
+def _siftup_min_numeric(a, pos, n):
+    item = a[pos]
+    child = 2 * pos + 1
+    while child < n:
+        right = child + 1
+        if right < n and a[right] < a[child]:
+            child = right
+        if a[child] < item:
+            a[pos] = a[child]
+            pos = child
+            child = 2 * pos + 1
+        else:
+            break
+    a[pos] = item
+
+
+@njit(cache=True, nogil=True)
+def _siftup_max_numeric(a, pos, n):
+    item = a[pos]
+    child = 2 * pos + 1
+    while child < n:
+        right = child + 1
+        if right < n and a[right] > a[child]:
+            child = right
+        if a[child] > item:
+            a[pos] = a[child]
+            pos = child
+            child = 2 * pos + 1
+        else:
+            break
+    a[pos] = item
+
+
+@njit(cache=True, nogil=True)
+def heapify_min_numeric(a):
+    '''
+    Floyd bottom-up heapify of a numeric array in min order, in place.
+    '''
+    n = len(a)
+    for i in range(n // 2 - 1, -1, -1):
+        _siftup_min_numeric(a, i, n)
+
+
+@njit(cache=True, nogil=True)
+def heapify_max_numeric(a):
+    '''
+    Floyd bottom-up heapify of a numeric array in max order, in place.
+    '''
+    n = len(a)
+    for i in range(n // 2 - 1, -1, -1):
+        _siftup_max_numeric(a, i, n)
+
+
+# noinspection PyShadowingBuiltins
+def heapify_numeric(a, max=False):  # pylint: disable=redefined-builtin
+    '''
+    Heapify a homogeneous numeric array in place in the requested
+    direction.
+    '''
+    if max:
+        heapify_max_numeric(a)
+    else:
+        heapify_min_numeric(a)
@@ -3,7 +3,9 @@ The same as the default implementation but without private imports.
 
 list-like implementation of heap/PriorityQueue.
 '''
+from bisect import insort
 from collections.abc import MutableSequence, Iterable, Iterator
+from operator import countOf
 from typing import TypeVar, Optional, Union
 from heapq import heappop, heappush, heappushpop, heapreplace, heapify
 
@@ -12,6 +14,53 @@ HeapContents = TypeVar('HeapContents')
 
 __version__ = '0.9.0b1'
 
+# below this size the backing list is kept fully sorted (storage here
+# is always maxified, so ascending order is always pop-first order),
+# sidestepping the sift machinery whose constant factors dominate at
+# such sizes.  A sorted list is itself a valid heap, so the heap
+# functions keep working on it and the Heap simply stops re-sorting
+# once it outgrows the tier.
+_SMALL_N = 8
+
+
+def _siftdown(heap, startpos, pos):
+    '''
+    Pure-python equivalent of heapq's private _siftdown, so that this
+    module sticks to public imports only.  Moves heap[pos] up toward
+    the root until it finds a smaller parent.
+    '''
+    new_item = heap[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        parent = heap[parentpos]
+        if new_item < parent:
+            heap[pos] = parent
+            pos = parentpos
+        else:
+            break
+    heap[pos] = new_item
+
+
+def _siftup(heap, pos):
+    '''
+    Pure-python equivalent of heapq's private _siftup.  Moves heap[pos]
+    down to a leaf following the smaller children, then sifts it back
+    up to its proper place.
+    '''
+    endpos = len(heap)
+    startpos = pos
+    new_item = heap[pos]
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos and not heap[childpos] < heap[rightpos]:
+            childpos = rightpos
+        heap[pos] = heap[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    heap[pos] = new_item
+    _siftdown(heap, startpos, pos)
+
 
 class Heap(MutableSequence[HeapContents]):
     # noinspection PyShadowingBuiltins
@@ -30,11 +79,15 @@ class Heap(MutableSequence[HeapContents]):
             items = []
 
         if tup is None:
-            if items is None:
-                tup = False
-            else:
+            if items:
                 tup = isinstance(items[0], tuple)
+            else:
+                tup = False
         self.tup = tup
+        self._maxify = self._build_maxify()
+        # True while the backing list of a small Heap is kept fully
+        # sorted; see _SMALL_N.
+        self._sorted = False
         if _set_no_check:
             self._heap = items
             return
@@ -42,59 +95,50 @@ class Heap(MutableSequence[HeapContents]):
         if self.max:
             items = [self._maxify(i) for i in items]
 
-        if items:
+        if len(items) < _SMALL_N:
+            items.sort()
+            self._sorted = True
+        else:
             heapify(items)
         self._heap: list[HeapContents] = items
 
     def __getitem__(self, pos: int) -> HeapContents:
         '''
-        Quite inefficient.
+        O((pos + 1) log (pos + 1)) -- cheap for small pos, but
+        still inefficient for positions deep into the Heap.
         '''
         if pos == 0:
+            if not self._heap:
+                raise IndexError('Heap index out of range')
             return self._maxify(self._heap[0])
         if pos < 0:
             pos = len(self) + pos
-
-        for i, item in enumerate(self):
-            if i == pos:
-                return item
-        raise IndexError('Heap index out of range')
+        return self._maxify(self._heap[self._kth_smallest(pos)])
 
     def __setitem__(self, pos: int, new_item: HeapContents) -> None:
         '''
-        Quite inefficient.  Simply removes the item at that position
-        and then appends a new one.  No guarantee at all that this will
-        be true:  `h[3] = 9;  h[3] == 9`.
+        Replaces the item at that sorted position with a new one and
+        re-sifts in place, O(log n) after finding the position.  No
+        guarantee at all that this will be true:  `h[3] = 9;  h[3] == 9`.
         '''
         if pos < 0:
             pos = len(self) + pos
-        if pos > len(self):
-            raise IndexError('Heap index out of range')
-
-        new_items: list[HeapContents] = []
-        for i, item in enumerate(self):
-            if i != pos:
-                new_items.append(self._maxify(item))  # we reverse maxification
-            else:
-                new_items.append(self._maxify(new_item))
-        heapify(new_items)
-        self._heap = new_items
+        heap_index = self._kth_smallest(pos)
+        self._heap[heap_index] = self._maxify(new_item)
+        self._sift_inplace(heap_index)
 
     def __delitem__(self, pos) -> None:
         '''
-        Quite inefficient
+        Swaps the item at that sorted position with the last item and
+        re-sifts in place, O(log n) after finding the position.
         '''
         if pos < 0:
             pos = len(self) + pos
-        if pos > len(self):
-            raise IndexError('Heap index out of range')
-
-        new_items: list[HeapContents] = []
-        for i, item in enumerate(self):
-            if i != pos:
-                new_items.append(self._maxify(item))  # we reverse maxification
-        heapify(new_items)
-        self._heap = new_items
+        heap_index = self._kth_smallest(pos)
+        last = self._heap.pop()
+        if heap_index < len(self._heap):
+            self._heap[heap_index] = last
+            self._sift_inplace(heap_index)
 
 
     def __len__(self) -> int:
@@ -104,12 +148,17 @@ class Heap(MutableSequence[HeapContents]):
         return bool(self._heap)
 
     def __contains__(self, item: HeapContents) -> bool:
-        return item in self._heap
+        return self._maxify(item) in self._heap
 
     def __iter__(self) -> Iterator[HeapContents]:
-        temp_heap = self._heap[:]
-        while temp_heap:
-            yield self._maxify(heappop(temp_heap))
+        '''
+        Iterate in sorted order without disturbing the Heap.  One
+        C-level sorted() call replaces the old copy-and-pop-n-times
+        loop (storage is maxified, so ascending is always pop order).
+        '''
+        if not self.max:
+            return iter(sorted(self._heap))
+        return map(self._maxify, sorted(self._heap))
 
     def __repr__(self) -> str:
         return f'Heap({list(self)}, max={self.max}, tup={self.tup})'
@@ -120,20 +169,88 @@ class Heap(MutableSequence[HeapContents]):
     def __sorted__(self, key=None) -> Iterator[HeapContents]:
         return iter(self)
 
-    def _maxify(self, item: HeapContents) -> HeapContents:
+    def _indexes_in_order(self) -> Iterator[int]:
+        '''
+        Yield indexes into the backing list in sorted order by lazily
+        expanding a frontier of heap nodes: after a node is yielded its
+        two children become candidates.  Reaching the k-th item costs
+        O(k log k) and never copies the backing list.  (Stored items
+        are already maxified, so min-order on them is always correct.)
+        '''
+        heap = self._heap
+        n = len(heap)
+        if not n:
+            return
+
+        frontier = [(heap[0], 0)]
+        while frontier:
+            _, i = heappop(frontier)
+            yield i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n:
+                    heappush(frontier, (heap[child], child))
+
+    def _kth_smallest(self, pos: int) -> int:
+        '''
+        Return the index in the backing list of the item at sorted
+        position `pos` (`pos`-th smallest, or largest if max).
+        '''
+        if 0 <= pos < len(self._heap):
+            for i, heap_index in enumerate(self._indexes_in_order()):
+                if i == pos:
+                    return heap_index
+        raise IndexError('Heap index out of range')
+
+    def _sift_inplace(self, heap_index: int) -> None:
+        '''
+        Restore the heap invariant after the item at heap_index (an
+        index into the backing list) has been replaced.  Sifting both
+        directions is correct whether the new item is larger or smaller
+        than the one it replaced; only one direction actually moves it.
+        '''
+        self._sorted = False
+        _siftup(self._heap, heap_index)
+        _siftdown(self._heap, 0, heap_index)
+
+    def _build_maxify(self):
+        '''
+        Resolve the max/tup branches once and return a specialized
+        callable, stored as self._maxify in __init__ and reverse().
+        The old method re-checked self.max and self.tup on every call
+        and, for tuples, paid a try/except per element each time.
+        '''
         if not self.max:
-            return item
+            return lambda item: item
+        return self._build_negator()
+
+    def _build_negator(self):
+        '''
+        Return the negating form of _maxify regardless of the current
+        direction.  For tuples the invertible positions are probed once
+        per type signature and cached, rather than paying a try/except
+        per element on every call.
+        '''
         if not self.tup:
-            return -item
-        new_i = []
-        for j in item:
-            try:
-                j = -j
-            except TypeError:
-                # might be a string or other non-invertible item.
-                pass
-            new_i.append(j)
-        return tuple(new_i)
+            return lambda item: -item
+
+        masks: dict[tuple, tuple[bool, ...]] = {}
+
+        def maxify_tuple(item):
+            sig = tuple(map(type, item))
+            mask = masks.get(sig)
+            if mask is None:
+                probed = []
+                for j in item:
+                    try:
+                        -j  # pylint: disable=pointless-statement
+                        probed.append(True)
+                    except TypeError:
+                        # might be a string or other non-invertible item.
+                        probed.append(False)
+                mask = masks[sig] = tuple(probed)
+            return tuple(-v if m else v for v, m in zip(item, mask))
+
+        return maxify_tuple
 
     def append(self, new_item: HeapContents) -> None:
         '''
@@ -143,26 +260,48 @@ class Heap(MutableSequence[HeapContents]):
 
     def clear(self) -> None:
         self._heap = []
+        self._sorted = True
 
     def copy(self) -> 'Heap[HeapContents]':
         return Heap(self._heap[:], max=self.max, tup=self.tup, _set_no_check=True)
 
     def count(self, item: HeapContents) -> int:
-        return self._heap.count(item)
+        '''
+        Number of occurrences of item.  Storage is maxified, so the
+        item must be maxified before the C-level countOf scan (the
+        same translation __contains__ does).
+        '''
+        return countOf(self._heap, self._maxify(item))
 
     def extend(self, others: Iterable[HeapContents]) -> None:
-        for o in others:
-            self.push(o)
+        '''
+        Bulk insert: append everything and rebuild with heapify, which
+        is O(n) by Floyd's bottom-up construction -- cheaper than n
+        individual O(log n) pushes.
+        '''
+        maxify = self._maxify
+        self._heap.extend(maxify(o) for o in others)
+        if len(self._heap) < _SMALL_N:
+            self._heap.sort()
+            self._sorted = True
+        else:
+            self._sorted = False
+            heapify(self._heap)
 
     def index(self, item: HeapContents, start: int = 0, end: int = -1) -> int:
         '''
-        Another inefficient operation
+        Return the position of item within the internal (arbitrary)
+        heap order -- the same ordering `raw()` exposes.  A heap has no
+        meaningful sorted position for anything but index 0, so this is
+        a single C-level list scan rather than a heap traversal.
         '''
-        for i, existing in self:
-            if existing == item and i >= start and (end == -1 or i < end):
-                return i
-
-        raise ValueError(f'{item!r} is not in Heap')
+        maxified = self._maxify(item)
+        if end == -1:
+            end = len(self._heap)
+        try:
+            return self._heap.index(maxified, start, end)
+        except ValueError:
+            raise ValueError(f'{item!r} is not in Heap') from None
 
     def insert(self, index: int, item: HeapContents) -> None:
         '''
@@ -185,28 +324,36 @@ class Heap(MutableSequence[HeapContents]):
             index = len(self._heap) + index
 
         if index == 0:
+            if self._sorted:
+                # first element of the sorted list; the remainder
+                # stays sorted.
+                return self._maxify(self._heap.pop(0))
             return self._maxify(heappop(self._heap))
 
         if index < 0 or index >= len(self._heap):
             raise IndexError('pop index out of range')
 
-        # inefficient time.
-        new_items = []
-        o: HeapContents = self._heap[0]
-        for i, item in enumerate(self):
-            rev_item = self._maxify(item)
-            if i == index:
-                o = item
-            else:
-                new_items.append(rev_item)
-        heapify(new_items)
-        self._heap = new_items
+        heap_index = self._kth_smallest(index)
+        o: HeapContents = self._maxify(self._heap[heap_index])
+        last = self._heap.pop()
+        if heap_index < len(self._heap):
+            self._heap[heap_index] = last
+            self._sift_inplace(heap_index)
         return o
 
     def push(self, new_item: HeapContents) -> None:
-        heappush(self._heap, self._maxify(new_item))
+        heap = self._heap
+        if self._sorted:
+            if len(heap) < _SMALL_N:
+                insort(heap, self._maxify(new_item))
+                return
+            # outgrew the small tier: the sorted list is already a
+            # valid heap, so just stop re-sorting.
+            self._sorted = False
+        heappush(heap, self._maxify(new_item))
 
     def pushpop(self, new_item: HeapContents) -> HeapContents:
+        self._sorted = False
         return self._maxify(heappushpop(self._heap, self._maxify(new_item)))
 
     def raw(self) -> list[HeapContents]:
@@ -214,7 +361,12 @@ class Heap(MutableSequence[HeapContents]):
         The `raw` method returns the contents of the heap in
         arbitrary order.  Useful for efficiently calling `set(h.raw())`.
         '''
-        return [self._maxify(i) for i in self._heap]
+        if not self.max:
+            # one C-level copy; handing out self._heap itself would let
+            # callers scramble the heap.
+            return self._heap[:]
+        maxify = self._maxify
+        return [maxify(i) for i in self._heap]
 
     def remove(self, item: HeapContents) -> None:
         '''
@@ -224,18 +376,44 @@ class Heap(MutableSequence[HeapContents]):
         removed the smallest/largest item that equaled item.
         '''
         try:
-            self._heap.remove(self._maxify(item))
+            heap_index = self._heap.index(self._maxify(item))
         except ValueError:
-            raise ValueError('Heap.remove(x): x not in Heap')
-        heapify(self._heap)
+            raise ValueError('Heap.remove(x): x not in Heap') from None
+
+        last = self._heap.pop()
+        if heap_index < len(self._heap):
+            self._heap[heap_index] = last
+            self._sift_inplace(heap_index)
 
     def replace(self, item: HeapContents) -> HeapContents:
-        return heapreplace(self._heap, self._maxify(item))
+        self._sorted = False
+        return self._maxify(heapreplace(self._heap, self._maxify(item)))
 
     def reverse(self) -> None:
         self.max = not self.max
-        self._heap = [self._maxify(i) for i in self._heap]
-        heapify(self._heap)
+        self._maxify = self._build_maxify()
+        # storage is negated exactly when max is True, so flipping the
+        # direction means negating the storage either way -- using
+        # self._maxify here (identity when flipping to min) used to
+        # leave the storage negated and the heap scrambled.  Negating
+        # in place avoids allocating a second list, and zero or one
+        # item is a valid heap without the heapify.
+        negate = self._build_negator()
+        heap = self._heap
+        for i in range(len(heap)):
+            heap[i] = negate(heap[i])
+        if self._sorted:
+            if self.tup:
+                # tuples may hold non-invertible members (strings) that
+                # the negation mask leaves alone, so the negated list
+                # is not simply the old order reversed: re-sort it.
+                heap.sort()
+            else:
+                # negating an ascending sorted list makes it
+                # descending: one reversal re-sorts it.
+                heap.reverse()
+        elif len(heap) > 1:
+            heapify(heap)
 
     def sort(self, key=None) -> None:
         '''